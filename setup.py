@@ -28,7 +28,8 @@ setup(
         'BeautifulSoup4>=4.9.1',
         'html5lib>=1.1',
         'feedparser>=6.0.2',
-        'sqlalchemy>=1.3.20',
+        'cachetools>=4.1',
+        'sqlalchemy>=1.4',
         'waitress'
     ],
     extras_require={
@@ -63,9 +63,11 @@ def test_g(app):
     app.get_json('/languoids?q=berbery')
     app.get_json('/languoids?q=berber')
     app.get_json('/languoids?q=austronesian')
+    app.get_json('/languoids?q=erber&mode=contains')
     app.get('/languoids?id=gberber', status=404)
     app.get('/languoids?id=x-berber', status=404)
     app.get('/languoids?id=g-berberyyy', status=404)
+    app.get('/languoids?id=w-%3Cscript%3E', status=404)
 
 
 def test_feature(app):
@@ -118,5 +120,29 @@ def test_olac(app):
 
 def test_blog_feed(app, mocker):
     app.get('/blog', status=404)
+    app.get('/blog?path=test&n=x', status=404)
     mocker.patch('wals3.views.atom_feed', mocker.Mock(return_value=Response('test')))
     assert 'test' in app.get('/blog?path=test')
+
+
+def test_blog_feeds(app, mocker):
+    app.get('/blogs', status=404)
+    app.get('/blogs?' + '&'.join(['path=a'] * 9), status=404)
+
+    years = dict(a=['2010'], b=['2012', '2011'])
+
+    def feed(url):
+        name = url.split('/')[-1]
+        return name, tuple(
+            dict(title='entry-%s-%s' % (name, y), link=url, updated=y + '-01-01T00:00:00',
+                 summary='')
+            for y in years[name])
+
+    mocker.patch('wals3.views._get_feed', mocker.Mock(side_effect=feed))
+    body = app.get('/blogs?path=a&path=b').text
+    assert body.index('entry-b-2012') < body.index('entry-b-2011') \
+        < body.index('entry-a-2010')
+    body = app.get('/blogs?path=a&path=b&n=2').text
+    assert 'entry-b-2011' in body and 'entry-a-2010' not in body
+    body = app.get('/blogs?path=a&path=a').text
+    assert body.count('entry-a-2010') == 1
@@ -5,12 +5,15 @@ from pathlib import Path
 from pyramid.httpexceptions import HTTPFound
 
 from clld.db.models.common import ValueSet, Language
+from wals3.models import Genus
 from wals3.interfaces import IBlog
 
 
 def test_comment(env, request_factory, mocker):
+    from wals3 import views
     from wals3.views import comment
 
+    mocker.patch.dict(views._POST_URL_CACHE, clear=True)
     env['registry'].registerUtility(mocker.Mock(post_url=lambda *a, **kw: '/'), IBlog)
     with request_factory(matchdict=dict(fid='51A', lid='esm')) as req:
         assert isinstance(comment(req), HTTPFound)
@@ -65,3 +68,77 @@ def test_Matrix(env):
     assert p.exists()
     p.unlink()
 
+
+def test_atom_feed_cache(env, mocker):
+    from wals3 import views
+
+    fetch = mocker.patch(
+        'wals3.views._fetch_feed', mocker.Mock(return_value=('t', ())))
+    mocker.patch.dict(views._FEED_CACHE, clear=True)
+    views.atom_feed(env['request'], 'http://example.org/feed')
+    views.atom_feed(env['request'], 'http://example.org/feed')
+    assert fetch.call_count == 1
+
+
+def test_LanguoidIndex(env):
+    from wals3.views import LanguoidIndex
+
+    index = LanguoidIndex()
+    matches = index.prefix_matches('Berber')
+    assert ('g', Genus.get('berber').pk) in matches
+    assert not index.prefix_matches('xyzxyz')
+    assert len(index.prefix_matches('a', max_results=5)) == 5
+
+
+def test_LanguoidIndex_sortkey(mocker):
+    from wals3.views import LanguoidIndex
+
+    query = mocker.Mock(with_entities=lambda *cols: [('Xa', 1, None), ('Xb', 2, 'xb')])
+    mocker.patch(
+        'wals3.views._languoid_sources',
+        mocker.Mock(return_value=[('w', query, None, None, None)]))
+    assert LanguoidIndex().prefix_matches('x') == [('w', 2), ('w', 1)]
+
+
+def test_parse_feed():
+    from io import BytesIO
+    from wals3.views import _parse_feed
+
+    title, entries = _parse_feed(BytesIO(b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>WALS</title>
+<item><title>A</title><link>http://example.org/a</link>
+<pubDate>Mon, 06 Sep 2010 16:45:00 +0200</pubDate><description>text</description></item>
+<item><title>B</title><link>http://example.org/b</link></item>
+</channel></rss>"""))
+    assert title == 'WALS'
+    assert len(entries) == 1
+    assert entries[0]['updated'] == '2010-09-06T14:45:00'
+
+    title, entries = _parse_feed(BytesIO(b"""<feed xmlns="http://www.w3.org/2005/Atom">
+<title>WALS</title><entry><title>A</title><link href="http://example.org/a"/>
+<updated>2010-09-06T16:45:00.1234567+02:00</updated><summary>text</summary></entry>
+</feed>"""))
+    assert entries[0]['updated'] == '2010-09-06T14:45:00'
+
+
+def test_fetch_feed(mocker):
+    from io import BytesIO
+    from wals3 import views
+
+    # Not well-formed XML, because of the leading whitespace:
+    res = mocker.MagicMock(status_code=200, raw=BytesIO(b"""
+<?xml version="1.0"?><rss version="2.0"><channel><title>WALS</title></channel></rss>"""))
+    res.__enter__.return_value = res
+    get = mocker.patch.object(views._SESSION, 'get', return_value=res)
+    assert views._fetch_feed('http://example.org/feed')[0] == 'WALS'
+    assert get.call_count == 1
+
+
+def test_get_feed_failure(mocker):
+    from wals3 import views
+
+    fetch = mocker.patch('wals3.views._fetch_feed', mocker.Mock(return_value=None))
+    mocker.patch.dict(views._FEED_FAILURES, clear=True)
+    assert views._get_feed('http://example.org/feed') is None
+    assert views._get_feed('http://example.org/feed') is None
+    assert fetch.call_count == 1
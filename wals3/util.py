@@ -33,6 +33,13 @@ def comment_button(req, feature, language, class_=''):
     )
 
 
+def format_languoid(l):
+    return dict(
+        id='%s-%s' % (l.__class__.__name__.lower()[0], l.id),
+        text=l.name,
+        type=l.__class__.__name__)
+
+
 class LanguoidSelect(MultiSelect):
 
     """Allow selection of languoids by name.
@@ -42,10 +49,7 @@ class LanguoidSelect(MultiSelect):
     """
 
     def format_result(self, l):
-        return dict(
-            id='%s-%s' % (l.__class__.__name__.lower()[0], l.id),
-            text=l.name,
-            type=l.__class__.__name__)
+        return format_languoid(l)
 
     def get_options(self):
         return {
@@ -1,50 +1,388 @@
-import time
-from datetime import datetime
+import re
+import itertools
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from heapq import heapify, heappop
+from threading import Lock
+from xml.etree import ElementTree
 
 import feedparser
 import requests
-from requests.exceptions import ConnectionError, Timeout
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.exceptions import HTTPError
+from urllib3.util.retry import Retry
 from purl import URL
-from sqlalchemy.orm import joinedload
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import selectinload
 from pyramid.view import view_config
 from pyramid.renderers import render_to_response
+from pyramid.response import Response
 from pyramid.httpexceptions import HTTPFound, HTTPNotFound
 
 from clld.db.meta import DBSession
-from clld.db.models.common import ValueSet, Source, Language, LanguageIdentifier, Identifier
+from clld.db.models.common import (
+    ValueSet, Source, Language, LanguageIdentifier, Identifier, ContributionReference,
+)
 from clld.db.util import icontains
 from clld.web.views.olac import OlacConfig, olac_with_cfg, Participant, Institution
 from clld.util import summary
 
 from wals3.models import Family, Genus, Feature, WalsLanguage
-from wals3.util import LanguoidSelect, blog
+from wals3.util import format_languoid, blog
+
+# A shared session, so that proxied feed requests re-use connections to the upstream
+# server and transient failures are retried:
+_SESSION = requests.Session()
+for _scheme in ['http://', 'https://']:
+    _SESSION.mount(_scheme, HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(['GET']))))
+
+RFC3339_PATTERN = re.compile(
+    r'(?P<date>[0-9]{4}-[0-9]{2}-[0-9]{2})[Tt ](?P<time>[0-9]{2}:[0-9]{2}:[0-9]{2})'
+    r'(\.[0-9]+)?(?P<tz>[Zz]|[+-][0-9]{2}:?[0-9]{2})?')
+
+# Upper bound for the number of entries we process per feed:
+MAX_FEED_ENTRIES = 50
+
+# Upper bound for the number of feeds proxied in one request, and the pool fetching them:
+MAX_FEEDS = 8
+_FEED_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_FEEDS)
+
+# Parsed feeds, keyed by URL:
+_FEED_CACHE = TTLCache(maxsize=64, ttl=60)
+_FEED_LOCK = Lock()
+# Futures for feeds currently being fetched, keyed by URL:
+_FEED_PENDING = {}
+# URLs of feeds which could not be retrieved recently:
+_FEED_FAILURES = TTLCache(maxsize=64, ttl=10)
+
+# Rendered genealogy pages, keyed by (host URL, dataset update timestamp):
+_GENEALOGY_CACHE = TTLCache(maxsize=8, ttl=3600)
+_GENEALOGY_LOCK = Lock()
+
+# URLs of blog posts for datapoints, keyed by valueset id:
+_POST_URL_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_POST_URL_LOCK = Lock()
+_POST_URL_PENDING = {}
+
+# Languoid suggestions, keyed by (normalized query, search mode):
+_LANGUOIDS_CACHE = TTLCache(maxsize=1024, ttl=5)
+_LANGUOIDS_LOCK = Lock()
+# Futures for suggestions currently being computed, keyed like the cache:
+_LANGUOIDS_PENDING = {}
+
+
+def _unique(keys):
+    seen = set()
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def _coalesced(key, compute, cache, pending, lock):
+    """
+    Look up `key` in `cache`, calling `compute` to fill in missing values.
+
+    Concurrent lookups of the same missing key wait for a single computation, while
+    different keys are computed in parallel. `lock` only guards `cache` and the map of
+    `pending` computations. `None` results are not cached.
+    """
+    with lock:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        future = pending.get(key)
+        if future is not None:
+            owner = False
+        else:
+            future = pending[key] = Future()
+            owner = True
+
+    if not owner:
+        return future.result()
+
+    try:
+        value = compute()
+        with lock:
+            if value is not None:
+                cache[key] = value
+        future.set_result(value)
+        return value
+    except Exception as e:  # pragma: no cover
+        future.set_exception(e)
+        raise
+    finally:
+        with lock:
+            del pending[key]
+
+
+def _localname(tag):
+    return tag.rpartition('}')[2]
 
 
-def atom_feed(request, feed_url):
+def _child(el, name):
+    for child in el:
+        if _localname(child.tag) == name:
+            return child
+
+
+def _parse_rfc3339(s):
     """
-    Proxy feeds so they can be accessed via XHR requests.
+    Parse an RFC 3339 timestamp - as used in ATOM - with any number of fractional digits.
 
-    We also convert RSS to ATOM so that the javascript Feed component can read them.
+    Note: We don't rely on `datetime.fromisoformat`, which is not available on py36 and
+    rejects valid RFC 3339 timestamps on older Python versions.
+    """
+    match = RFC3339_PATTERN.fullmatch(s)
+    if not match:
+        raise ValueError(s)
+    dt = datetime.strptime(match.group('date') + match.group('time'), '%Y-%m-%d%H:%M:%S')
+    tz = match.group('tz')
+    if tz:
+        if tz in 'Zz':
+            dt = dt.replace(tzinfo=timezone.utc)
+        else:
+            offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+            dt = dt.replace(tzinfo=timezone(-offset if tz[0] == '-' else offset))
+    return dt
+
+
+def _utc_isoformat(dt):
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.replace(microsecond=0).isoformat()
+
+
+def _parse_entry(el):
+    """
+    Extract the data we need from an RSS item or ATOM entry element.
+
+    :return: `dict` or `None` if the entry has no timestamp.
     """
-    ctx = {'url': feed_url, 'title': None, 'entries': []}
+    def text(*names):
+        for name in names:
+            child = _child(el, name)
+            if child is not None and child.text:
+                return child.text.strip()
+
+    link = None
+    for child in el:
+        if _localname(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+            link = child.get('href') or (child.text or '').strip()
+            break
+
+    published = text('pubDate')
     try:
-        res = requests.get(ctx['url'], timeout=(3.05, 1))
-    except Timeout:  # pragma: no cover
-        res = None
-    if res and res.status_code == 200:
-        d = feedparser.parse(res.content.strip())
-        ctx['title'] = getattr(d.feed, 'title', None)
-        for e in d.entries:
-            ctx['entries'].append(dict(
-                title=e.title,
-                link=e.link,
-                updated=datetime.fromtimestamp(time.mktime(e.published_parsed)).isoformat(),
-                summary=summary(e.description)))
-    response = render_to_response('atom_feed.mako', ctx, request=request)
+        if published:
+            updated = _utc_isoformat(parsedate_to_datetime(published))
+        else:
+            published = text('published', 'updated')
+            if not published:
+                # ATOM requires a timestamp for each entry.
+                return
+            updated = _utc_isoformat(_parse_rfc3339(published))
+    except (TypeError, ValueError):
+        return
+
+    return dict(
+        title=text('title'),
+        link=link,
+        updated=updated,
+        summary=summary(text('description', 'summary', 'content') or ''))
+
+
+def _parse_feed(stream):
+    """
+    Parse RSS or ATOM from a file-like object, reading only as much as needed.
+
+    :return: pair (title, entries).
+    """
+    title, entries, in_entry = None, [], False
+    for event, el in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = _localname(el.tag)
+        if tag in ['item', 'entry']:
+            in_entry = event == 'start'
+            if event == 'end':
+                entry = _parse_entry(el)
+                if entry:
+                    entries.append(entry)
+                el.clear()
+                if len(entries) == MAX_FEED_ENTRIES:
+                    break
+        elif event == 'end' and tag == 'title' and title is None and not in_entry:
+            title = el.text
+    return title, tuple(entries)
+
+
+def _feedparser_parse(stream):
+    """
+    Parse a feed with feedparser, which can also handle feeds which aren't well-formed.
+
+    :return: pair (title, entries).
+    """
+    # We only proxy our own blog, so sanitizing HTML and resolving relative URLs can be
+    # skipped:
+    d = feedparser.parse(stream, resolve_relative_uris=False, sanitize_html=False)
+    entries = []
+    for e in d.entries[:MAX_FEED_ENTRIES]:
+        published = e.get('published_parsed') or e.get('updated_parsed')
+        if not published:
+            # ATOM requires a timestamp for each entry.
+            continue
+        entries.append(dict(
+            title=e.title,
+            link=e.link,
+            updated=datetime(*published[:6]).isoformat(),
+            summary=summary(e.description)))
+    return getattr(d.feed, 'title', None), tuple(entries)
+
+
+class _RecordingReader(object):
+    """
+    Wraps a binary stream, keeping a copy of the first `limit` bytes read.
+
+    This allows to re-parse the data with a different parser without fetching it again.
+    """
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.chunks = []
+        self.overflow = False
+
+    def read(self, size=-1):
+        chunk = self.stream.read(size)
+        if not self.overflow:
+            self.chunks.append(chunk)
+            self.limit -= len(chunk)
+            if self.limit < 0:
+                self.overflow, self.chunks = True, []
+        return chunk
+
+
+def _drain(stream, limit=2 ** 16):
+    """
+    Read the rest of a response body - if it is smaller than `limit` bytes.
+
+    Connections are only returned to the pool after the body has been read completely.
+    For bigger rests, dropping the connection is cheaper than downloading the data.
+    """
+    while limit > 0:
+        chunk = stream.read(min(limit, 2 ** 13))
+        if not chunk:
+            break
+        limit -= len(chunk)
+
+
+def _fetch_feed(feed_url):
+    """
+    Fetch and parse a feed.
+
+    Only the first `MAX_FEED_ENTRIES` entries are processed.
+
+    :return: pair (title, entries) or `None` if the feed could not be retrieved.
+    """
+    try:
+        with _SESSION.get(feed_url, stream=True, timeout=(3.05, 1)) as res:
+            if res.status_code != 200:
+                return
+            # Parse the (decompressed) response stream, rather than buffering the full
+            # body in memory first:
+            res.raw.decode_content = True
+            stream = _RecordingReader(res.raw, 2 ** 18)
+            try:
+                feed = _parse_feed(stream)
+            except ElementTree.ParseError:
+                if stream.overflow:
+                    # We don't keep big feeds in memory, so can't re-parse them.
+                    return
+                # Not well-formed XML: Leave it to feedparser, which is more lenient.
+                feed = _feedparser_parse(b''.join(stream.chunks) + res.raw.read())
+            _drain(res.raw)
+            return feed
+    except (RequestException, HTTPError):  # pragma: no cover
+        return
+
+
+def _get_feed(feed_url):
+    """
+    Retrieve a feed from the cache or from upstream.
+
+    Failures are remembered for `_FEED_FAILURES.ttl` seconds, so that a broken upstream
+    server isn't contacted - including retries - with every request.
+
+    :return: pair (title, entries) or `None` if the feed could not be retrieved.
+    """
+    with _FEED_LOCK:
+        if feed_url in _FEED_FAILURES:
+            return
+    feed = _coalesced(
+        feed_url, lambda: _fetch_feed(feed_url), _FEED_CACHE, _FEED_PENDING, _FEED_LOCK)
+    if feed is None:
+        with _FEED_LOCK:
+            _FEED_FAILURES[feed_url] = True
+    return feed
+
+
+def _render_atom(request, url, title, entries):
+    response = render_to_response(
+        'atom_feed.mako',
+        {'url': url, 'title': title, 'entries': list(entries)},
+        request=request)
     response.content_type = 'application/atom+xml'
     return response
 
 
+def atom_feed(request, feed_url, max_entries=20):
+    """
+    Proxy feeds so they can be accessed via XHR requests.
+
+    We also convert RSS to ATOM so that the javascript Feed component can read them.
+    Successfully retrieved feeds are cached for `_FEED_CACHE.ttl` seconds.
+
+    :param max_entries: Maximal number of entries to include in the ATOM feed.
+    """
+    title, entries = _get_feed(feed_url) or (None, ())
+    return _render_atom(request, feed_url, title, entries[:max_entries])
+
+
+def _blog_feed_params(request):
+    """
+    :return: pair (list of distinct blog feed URLs, maximal number of entries).
+    """
+    paths = request.params.getall('path')
+    if len(paths) > MAX_FEEDS:
+        raise HTTPNotFound()
+    urls = []
+    for path in paths:
+        if not path:
+            raise HTTPNotFound()
+        path = URL(path)
+        assert not path.host()
+        urls.append(blog(request).url(path.as_string()))
+    if not urls:
+        raise HTTPNotFound()
+    # Each feed is fetched - and its entries included - only once:
+    urls = list(_unique(urls))
+    try:
+        max_entries = min(max(int(request.params.get('n', 20)), 1), MAX_FEED_ENTRIES)
+    except ValueError:
+        raise HTTPNotFound()
+    return urls, max_entries
+
+
 @view_config(route_name='blog_feed')
 def blog_feed(request):
     """
@@ -52,77 +390,184 @@ def blog_feed(request):
 
     We also convert RSS to ATOM so that clld's javascript Feed component can read them.
     """
-    if not request.params.get('path'):
-        raise HTTPNotFound()
-    path = URL(request.params['path'])
-    assert not path.host()
-    try:
-        return atom_feed(request, blog(request).url(path.as_string()))
-    except ConnectionError:  # pragma: no cover
-        raise HTTPNotFound()
+    urls, max_entries = _blog_feed_params(request)
+    return atom_feed(request, urls[0], max_entries=max_entries)
 
 
-@view_config(route_name='languoids', renderer='json')
-def languoids(request):
-    if request.params.get('id'):
-        if '-' not in request.params['id']:
-            return HTTPNotFound()
-        m, id_ = request.params['id'].split('-', 1)
-        model = dict(w=Language, g=Genus, f=Family).get(m)
-        if not model:
-            return HTTPNotFound()
-        obj = model.get(id_, default=None)
-        if not obj:
-            return HTTPNotFound()
-        return HTTPFound(location=request.resource_url(obj))
+@view_config(route_name='blog_feeds')
+def blog_feeds(request):
+    """
+    Proxy multiple feeds from the blog, merged into one ATOM feed.
 
-    max_results = 20
-    qs = request.params.get('q')
-    if not qs:
-        return []
+    The feeds are fetched concurrently, so that the response time is determined by the
+    slowest upstream feed rather than the sum of all.
+    """
+    urls, max_entries = _blog_feed_params(request)
+    feeds = [feed for feed in _FEED_EXECUTOR.map(_get_feed, urls) if feed]
+    entries = sorted(
+        itertools.chain(*[entries for _, entries in feeds]),
+        key=lambda e: e['updated'],
+        reverse=True)
+    return _render_atom(
+        request,
+        blog(request).url(),
+        feeds[0][0] if feeds else None,
+        entries[:max_entries])
 
-    query = DBSession.query(Language)\
-        .filter(icontains(Language.name, qs))\
-        .order_by(WalsLanguage.ascii_name).limit(max_results)
 
-    res = [l for l in query]
+LANGUOID_MODELS = dict(w=Language, g=Genus, f=Family)
+LANGUOID_ID_PATTERN = re.compile(r'[wgf]-[A-Za-z0-9_.-]{1,64}')
 
-    if len(res) < max_results:
-        max_results = max_results - len(res)
 
-        # fill up suggestions with matching alternative names:
-        for l in DBSession.query(Language)\
-                .join(Language.languageidentifier, LanguageIdentifier.identifier)\
-                .filter(icontains(Identifier.name, qs))\
-                .order_by(WalsLanguage.ascii_name).limit(max_results):
-            if l not in res:
-                res.append(l)
+def _languoid_sources():
+    """
+    Sources for languoid suggestions, in order of precedence.
 
-    if len(res) < max_results:
-        max_results = max_results - len(res)
+    :return: `list` of tuples (kind, query, pk column, name column, sortkey column).
+    """
+    return [
+        # languages, by name:
+        ('w', DBSession.query(WalsLanguage),
+         Language.pk, Language.name, WalsLanguage.ascii_name),
+        # languages, by alternative name:
+        ('w', DBSession.query(WalsLanguage)
+         .join(Language.languageidentifier, LanguageIdentifier.identifier),
+         Language.pk, Identifier.name, WalsLanguage.ascii_name),
+        ('g', DBSession.query(Genus), Genus.pk, Genus.name, Genus.name),
+        ('f', DBSession.query(Family), Family.pk, Family.name, Family.name),
+    ]
+
+
+class LanguoidIndex(object):
+    """
+    In-memory index of lowercased languoid names, supporting prefix lookup.
 
-        # fill up with matching genera:
-        for l in DBSession.query(Genus)\
-                .filter(icontains(Genus.name, qs))\
-                .order_by(Genus.name).limit(max_results):
-            res.append(l)
+    Languoid names do not change at runtime, so the index is built once, on first use.
+    """
 
-    if len(res) < max_results:
-        max_results = max_results - len(res)
+    def __init__(self):
+        self._keys = None
+        self._items = None
+        self._lock = Lock()
+
+    def _build(self):
+        rows = []
+        for rank, (kind, query, pk, name, sortkey) in enumerate(_languoid_sources()):
+            for name_, pk_, sortkey_ in query.with_entities(name, pk, sortkey):
+                if name_:
+                    # Like the database, we sort missing sortkeys last:
+                    rows.append((
+                        name_.lower(),
+                        rank,
+                        (sortkey_ is None, sortkey_ or ''),
+                        kind,
+                        pk_))
+        rows.sort()
+        self._keys = [row[0] for row in rows]
+        self._items = [row[1:] for row in rows]
+
+    def prefix_matches(self, prefix, max_results=20):
+        """
+        Look up languoids with a name starting with `prefix`.
+
+        :return: `list` of at most `max_results` (kind, pk) pairs, in order of precedence.
+        """
+        with self._lock:
+            if self._keys is None:
+                self._build()
+        prefix = prefix.lower()
+        # Matching names form a contiguous slice of the sorted keys:
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=start)
+        # Rather than sorting all matches by precedence, we only pop as many from a heap
+        # as needed to collect `max_results` distinct languoids:
+        matches = self._items[start:end]
+        heapify(matches)
+
+        def ordered():
+            while matches:
+                _, _, kind, pk = heappop(matches)
+                yield kind, pk
+
+        return list(itertools.islice(_unique(ordered()), max_results))
+
+
+_LANGUOID_INDEX = LanguoidIndex()
+
+
+def _matching_languoids(qs, max_results):
+    """
+    Search the database for languoids with names containing `qs`.
 
-        # fill up with matching families:
-        for l in DBSession.query(Family)\
-                .filter(icontains(Family.name, qs))\
-                .order_by(Family.name).limit(max_results):
-            res.append(l)
+    :return: `list` of (kind, pk) pairs, in order of precedence.
+    """
+    # All candidates are fetched in a single round-trip:
+    matches = union_all(*[
+        select(
+            query.filter(icontains(name, qs)).with_entities(
+                literal(kind).label('kind'),
+                literal(rank).label('rank'),
+                pk.label('pk'),
+                sortkey.label('sortkey'),
+            ).order_by(sortkey).limit(max_results).subquery())
+        for rank, (kind, query, pk, name, sortkey) in enumerate(_languoid_sources())
+    ]).subquery()
+    return list(_unique((kind, pk) for kind, pk in DBSession.execute(
+        select(matches.c.kind, matches.c.pk)
+        .order_by(matches.c.rank, matches.c.sortkey))))
+
+
+def _languoid_suggestions(qs, contains=False, max_results=20):
+    keys = _LANGUOID_INDEX.prefix_matches(qs, max_results)
+    if contains and len(keys) < max_results:
+        # fill up with languoids matching anywhere in the name:
+        keys = list(_unique(keys + _matching_languoids(qs, max_results)))[:max_results]
+
+    objs = {}
+    for kind, model in LANGUOID_MODELS.items():
+        pks = [pk for k, pk in keys if k == kind]
+        if pks:
+            objs.update(
+                ((kind, o.pk), o)
+                for o in DBSession.query(model).filter(model.pk.in_(pks)))
+    return [format_languoid(objs[key]) for key in keys]
 
-    ms = LanguoidSelect(request, None, None, url='x')
-    return dict(results=list(map(ms.format_result, res)), context={}, more=False)
 
+@view_config(route_name='languoids', renderer='json')
+def languoids(request):
+    if request.params.get('id'):
+        # Reject malformed ids without touching the database:
+        if not LANGUOID_ID_PATTERN.fullmatch(request.params['id']):
+            raise HTTPNotFound()
+        m, id_ = request.params['id'].split('-', 1)
+        obj = LANGUOID_MODELS[m].get(id_, default=None)
+        if not obj:
+            raise HTTPNotFound()
+        return HTTPFound(location=request.resource_url(obj))
 
-@view_config(route_name='feature_info', renderer='json')
-def info(request):
-    feature = Feature.get(request.matchdict['id'])
+    qs = request.params.get('q')
+    if not qs:
+        return []
+
+    # By default, we only suggest languoids with names starting with the query, which can
+    # be served from memory. Matches anywhere in the name must be requested explicitly:
+    contains = request.params.get('mode') == 'contains'
+
+    # Identical queries - typically issued concurrently by many clients - are answered
+    # from a short-lived cache:
+    results = _coalesced(
+        (qs.lower(), contains),
+        lambda: _languoid_suggestions(qs, contains=contains),
+        _LANGUOIDS_CACHE,
+        _LANGUOIDS_PENDING,
+        _LANGUOIDS_LOCK)
+    return dict(results=results, context={}, more=False)
+
+
+@lru_cache(maxsize=256)
+def _feature_info(id_):
+    # Features are static, so we can cache the JSON data - not the ORM object.
+    feature = Feature.get(id_)
     return {
         'name': feature.name,
         'values': [{'name': d.name, 'number': i + 1}
@@ -130,22 +575,50 @@ def info(request):
     }
 
 
+@view_config(route_name='feature_info', renderer='json')
+def info(request):
+    return _feature_info(request.matchdict['id'])
+
+
 @view_config(route_name='datapoint', request_method='POST')
 def comment(request):
     """check whether a blog post for the datapoint does exist.
 
     if not, create one and redirect there.
     """
-    vs = ValueSet.get('%(fid)s-%(lid)s' % request.matchdict)
-    return HTTPFound(blog(request).post_url(vs, request, create=True) + '#comment')
-
-
-@view_config(route_name='genealogy', renderer='genealogy.mako')
+    md = request.matchdict
+    vs_id = f"{md['fid']}-{md['lid']}"
+    # Checking for - and possibly creating - the post requires calls to the blog's API,
+    # so we cache the resulting URL:
+    url = _coalesced(
+        vs_id,
+        lambda: blog(request).post_url(ValueSet.get(vs_id), request, create=True),
+        _POST_URL_CACHE,
+        _POST_URL_PENDING,
+        _POST_URL_LOCK)
+    return HTTPFound(url + '#comment')
+
+
+@view_config(route_name='genealogy')
 def genealogy(request):
+    """
+    Render the full classification.
+
+    Since this traverses all families, genera and languages, the rendered page is cached
+    until the dataset is updated.
+    """
+    key = (request.host_url, request.dataset.updated)
     request.tm.abort()
-    return dict(
-        families=DBSession.query(Family).order_by(Family.id)
-        .options(joinedload(Family.genera, Genus.languages)))
+    with _GENEALOGY_LOCK:
+        body = _GENEALOGY_CACHE.get(key)
+        if body is None:
+            body = _GENEALOGY_CACHE[key] = render_to_response(
+                'genealogy.mako',
+                dict(
+                    families=DBSession.query(Family).order_by(Family.id)
+                    .options(selectinload(Family.genera).selectinload(Genus.languages))),
+                request=request).body
+    return Response(body=body, content_type='text/html', charset='utf-8')
 
 
 @view_config(route_name='sample', renderer='sample.mako')
@@ -158,6 +631,10 @@ def sample_alt(ctx, _):
     return ctx
 
 
+# OLAC archive descriptions, keyed by (dataset pk, dataset update timestamp):
+_OLAC_DESCRIPTIONS = {}
+
+
 class OlacConfigSource(OlacConfig):
     def _query(self, req):
         return req.db.query(Source)
@@ -171,12 +648,20 @@ class OlacConfigSource(OlacConfig):
         return rec
 
     def query_records(self, req, from_=None, until=None):
-        q = self._query(req).order_by(Source.pk)
+        # Records are serialized using `obj.bibtex()` - i.e. most of the columns of
+        # Source - as well as the languages and contribution references, so we eager load
+        # the latter:
+        q = self._query(req).order_by(Source.pk).options(
+            selectinload(Source.languages),
+            selectinload(Source.contributionreferences)
+            .joinedload(ContributionReference.contribution))
         if from_:
             q = q.filter(Source.updated >= from_)
         if until:
             q = q.filter(Source.updated < until)
-        return q
+        # Harvests may comprise the full RefDB, so we fetch rows in batches from a
+        # server-side cursor rather than buffering the full result:
+        return q.execution_options(stream_results=True).yield_per(1000)
 
     def format_identifier(self, req, item):
         return self.delimiter.join(
@@ -187,6 +672,13 @@ class OlacConfigSource(OlacConfig):
         return int(id_.split(self.delimiter)[-1])
 
     def description(self, req):
+        # OlacConfigSource is instantiated per request, so we cache on module level:
+        key = (req.dataset.pk, req.dataset.updated)
+        if key not in _OLAC_DESCRIPTIONS:
+            _OLAC_DESCRIPTIONS[key] = self._description(req)
+        return _OLAC_DESCRIPTIONS[key]
+
+    def _description(self, req):
         return {
             'archiveURL': 'http://%s/refdb_oai' % req.dataset.domain,
             'participants': [